@@ -1,10 +1,60 @@
 """Core module for tt-csv-matcher."""
 
+import sys
 from dataclasses import dataclass, field
 from typing import Optional
 
+from core.normalize import normalize_for_tolerant_comparison, normalize_key
 
-@dataclass
+# One bit per issue code; bit order is the order issues are reported in
+ISSUE_BITS: dict[str, int] = {
+    'NAME_SWAPPED': 1 << 0,
+    'LASTNAME_FUZZY': 1 << 1,
+    'FIRSTNAME_FUZZY': 1 << 2,
+    'DOB_MOB_SWAPPED': 1 << 3,
+    'DOB_MISMATCH': 1 << 4,
+    'MOB_MISMATCH': 1 << 5,
+    'YOB_MISMATCH': 1 << 6,
+    'SEX_MISMATCH': 1 << 7,
+    'ASSOC_MISMATCH': 1 << 8,
+    'NO_MATCH': 1 << 9,
+}
+
+
+# Issue codes for every possible bitmap, indexed by the bitmap itself
+_ISSUE_CODE_TABLE: list[tuple[str, ...]] = [
+    tuple(code for code, bit in ISSUE_BITS.items() if bits & bit)
+    for bits in range(1 << len(ISSUE_BITS))
+]
+
+
+def issue_codes(bits: int) -> list[str]:
+    """Materialize an issue bitmap as a list of issue codes.
+
+    Args:
+        bits: Bitwise OR of ISSUE_BITS values.
+
+    Returns:
+        Issue codes in reporting order.
+    """
+    return list(_ISSUE_CODE_TABLE[bits])
+
+
+def _birth_keys(dob: int, mob: int, yob: int) -> tuple:
+    """Pack a birth date into keys for the date as is and with day/month swapped.
+
+    The swap key is None when day and month are equal, since swapping them
+    changes nothing; None never equals a birth key.
+    """
+    if 0 <= dob < 100 and 0 <= mob < 100:
+        birth_key, swap_key = yob * 10000 + mob * 100 + dob, yob * 10000 + dob * 100 + mob
+    else:
+        # Out-of-range values could collide when packed; tuples compare exactly
+        birth_key, swap_key = (yob, mob, dob), (yob, dob, mob)
+    return birth_key, (swap_key if dob != mob else None)
+
+
+@dataclass(slots=True)
 class Player:
     """Represents a player record from a CSV file."""
 
@@ -17,8 +67,30 @@ class Player:
     mob: int      # Month of birth
     yob: int      # Year of birth
 
+    # Derived from the name fields on construction (see __post_init__)
+    ln_key: str = field(init=False, repr=False, compare=False)
+    fn_key: str = field(init=False, repr=False, compare=False)
+    ln_tol: str = field(init=False, repr=False, compare=False)
+    fn_tol: str = field(init=False, repr=False, compare=False)
+    sex_key: str = field(init=False, repr=False, compare=False)
+    assoc_key: str = field(init=False, repr=False, compare=False)
+    birth_key: int | tuple = field(init=False, repr=False, compare=False)
+    swap_key: int | tuple | None = field(init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self) -> None:
+        # Precompute comparison forms once instead of per comparison
+        self.ln_key = normalize_key(self.last_name)
+        self.fn_key = normalize_key(self.first_name)
+        self.ln_tol = normalize_for_tolerant_comparison(self.last_name)
+        self.fn_tol = normalize_for_tolerant_comparison(self.first_name)
+        self.sex_key = sys.intern(self.sex.upper())
+        self.assoc_key = sys.intern(self.association.upper())
+        # birth_key of one player equals swap_key of another iff day and
+        # month are exchanged and the year is the same
+        self.birth_key, self.swap_key = _birth_keys(self.dob, self.mob, self.yob)
+
+
+@dataclass(slots=True)
 class MatchResult:
     """Result of matching an event player against the reference database."""
 
@@ -27,4 +99,9 @@ class MatchResult:
     match_type: str       # EXACT, NAME_SWAP, FUZZY, NONE
     confidence: float     # 0.0 – 1.0
     confidence_tolerant: float = 0.0  # 0.0 – 1.0 (tolerant name comparison)
-    issues: list[str] = field(default_factory=list)
+    issue_bits: int = 0   # Bitwise OR of ISSUE_BITS values
+
+    @property
+    def issues(self) -> list[str]:
+        """Issue codes, materialized from issue_bits."""
+        return issue_codes(self.issue_bits)
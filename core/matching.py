@@ -1,12 +1,25 @@
 """Multi-stage matching engine for player records."""
 
 import logging
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 
+import numpy as np
+from rapidfuzz import process
 from rapidfuzz.distance import JaroWinkler
 
-from core import Player, MatchResult
-from core.scoring import calculate_confidence, calculate_confidence_tolerant, detect_issues
+from core import ISSUE_BITS, Player, MatchResult
+from core.scoring import (
+    CONFIDENCE_SCALE,
+    RefArrays,
+    build_ref_arrays,
+    calculate_confidence_tolerant_batch,
+    confidence_units,
+    detect_issue_bits,
+    score_batch,
+)
 
 log = logging.getLogger(__name__)
 
@@ -14,26 +27,16 @@ log = logging.getLogger(__name__)
 DEFAULT_LASTNAME_THRESHOLD = 0.85
 DEFAULT_FIRSTNAME_THRESHOLD = 0.80
 
-
-def _normalize_key(value: str) -> str:
-    """Normalize a name for hash-index lookup."""
-    return value.strip().upper()
+# Safety margin for rapidfuzz's internal score_cutoff, which may reject
+# pairs that sit exactly on the threshold due to float rounding
+_CUTOFF_MARGIN = 1e-6
 
 
 def _build_name_index(players: list[Player]) -> dict[tuple[str, str], list[Player]]:
     """Build a hash index for exact name matching (last_name, first_name)."""
     index: dict[tuple[str, str], list[Player]] = defaultdict(list)
     for p in players:
-        key = (_normalize_key(p.last_name), _normalize_key(p.first_name))
-        index[key].append(p)
-    return dict(index)
-
-
-def _build_swap_index(players: list[Player]) -> dict[tuple[str, str], list[Player]]:
-    """Build a hash index for name-swap matching (first_name, last_name)."""
-    index: dict[tuple[str, str], list[Player]] = defaultdict(list)
-    for p in players:
-        key = (_normalize_key(p.first_name), _normalize_key(p.last_name))
+        key = (p.ln_key, p.fn_key)
         index[key].append(p)
     return dict(index)
 
@@ -45,9 +48,13 @@ def _pick_best_candidate(
     lastname_sim: float,
     firstname_sim: float,
 ) -> MatchResult:
-    """Pick the best candidate from a list based on confidence score."""
+    """Pick the best candidate from a list based on confidence score.
+
+    ``confidence_tolerant`` is left unset; _match_chunk fills it in for all
+    results at once.
+    """
     best_result: MatchResult | None = None
-    best_confidence = -1.0
+    best_confidence = -1
 
     for ref in candidates:
         ln_sim = lastname_sim
@@ -58,137 +65,399 @@ def _pick_best_candidate(
             ln_sim = 1.0
             fn_sim = 1.0
 
-        confidence = calculate_confidence(event, ref, ln_sim, fn_sim)
+        confidence = confidence_units(event, ref, ln_sim, fn_sim)
         if confidence > best_confidence:
             best_confidence = confidence
-            issues = detect_issues(event, ref, match_type, ln_sim, fn_sim)
-            conf_tolerant = calculate_confidence_tolerant(event, ref, ln_sim, fn_sim)
+            issue_bits = detect_issue_bits(event, ref, match_type, ln_sim, fn_sim)
             best_result = MatchResult(
                 event_player=event,
                 ref_player=ref,
                 match_type=match_type,
-                confidence=confidence,
-                confidence_tolerant=conf_tolerant,
-                issues=issues,
+                confidence=confidence / CONFIDENCE_SCALE,
+                issue_bits=issue_bits,
             )
 
     assert best_result is not None
     return best_result
 
 
-def _try_fuzzy_match(
-    event: Player,
-    ref_players: list[Player],
-    lastname_threshold: float,
-    firstname_threshold: float,
-) -> MatchResult | None:
-    """Try to find a fuzzy match for an event player.
+def _char_masks(names: list[str]) -> np.ndarray:
+    """Build a 32-bit character-set bitmask per name.
+
+    Characters are folded onto 32 bits (``ord(ch) & 31``), which maps A–Z
+    onto distinct bits. Collisions only ever make the mask filter weaker,
+    never reject a pair that could still match.
+    """
+    masks = np.zeros(len(names), dtype=np.uint32)
+    for i, name in enumerate(names):
+        mask = 0
+        for ch in set(name):
+            mask |= 1 << (ord(ch) & 31)
+        masks[i] = mask
+    return masks
+
+
+def _jaro_winkler_candidates(
+    length: int,
+    mask: int,
+    ref_lengths: np.ndarray,
+    ref_masks: np.ndarray,
+    cutoff: float,
+) -> np.ndarray:
+    """Select reference names that can still reach a Jaro-Winkler cutoff.
+
+    Jaro counts matching characters ``m``; characters of one name missing
+    from the other's character set cannot match, so ``m`` is bounded by the
+    shorter length minus those characters. Assuming zero transpositions and
+    the maximum Winkler prefix boost gives an upper bound of the similarity,
+    so the filter never drops a pair that would pass the cutoff.
+
+    Shared q-grams (e.g. a trigram index) are no such bound: transposed
+    letters keep the Jaro-Winkler score high while breaking every common
+    trigram (LIAN/ILAN scores 0.917 without one).
 
     Args:
-        event: Player from the event file.
-        ref_players: All reference players.
-        lastname_threshold: Minimum similarity for last name (0–1).
-        firstname_threshold: Minimum similarity for first name (0–1).
+        length: Length of the event name.
+        mask: Character-set bitmask of the event name.
+        ref_lengths: Lengths of all reference names.
+        ref_masks: Character-set bitmasks of all reference names.
+        cutoff: Minimum Jaro-Winkler similarity (0–1).
 
     Returns:
-        Best MatchResult if a fuzzy match is found, None otherwise.
+        Boolean array marking the reference names worth comparing.
+    """
+    # Winkler boosts scores above 0.7 by at most 4 * 0.1 * (1 - jaro),
+    # so this is the smallest Jaro score that can end up above the cutoff
+    if cutoff <= 0.82:
+        jaro_min = min(cutoff, 0.7)
+    else:
+        jaro_min = (cutoff - 0.4) / 0.6
+
+    mask = np.uint32(mask)
+    # bitwise_count yields uint8; widen it so that subtracting it from a long
+    # name's length (a Python int, cast to the array dtype) cannot overflow
+    missing_in_ref = np.bitwise_count(mask & ~ref_masks).astype(np.int32)
+    missing_in_event = np.bitwise_count(ref_masks & ~mask).astype(np.int32)
+    matches = np.minimum(length - missing_in_ref, ref_lengths - missing_in_event)
+
+    # (m / la + m / lb + 1) / 3 >= jaro_min, multiplied out to avoid division
+    return matches * (length + ref_lengths) >= (3.0 * jaro_min - 1.0) * length * ref_lengths
+
+
+@dataclass
+class RefState:
+    """Reference data prepared once for matching any number of event files.
+
+    Holds the name hash index for the exact/swap stages and the column arrays
+    used by the fuzzy stage, all positionally aligned with ``players``.
     """
-    event_ln = _normalize_key(event.last_name)
-    event_fn = _normalize_key(event.first_name)
 
-    best_result: MatchResult | None = None
-    best_confidence = -1.0
-
-    for ref in ref_players:
-        ref_ln = _normalize_key(ref.last_name)
-        ref_fn = _normalize_key(ref.first_name)
-
-        ln_sim = JaroWinkler.similarity(event_ln, ref_ln)
-        fn_sim = JaroWinkler.similarity(event_fn, ref_fn)
-
-        if ln_sim >= lastname_threshold and fn_sim >= firstname_threshold:
-            confidence = calculate_confidence(event, ref, ln_sim, fn_sim)
-            if confidence > best_confidence:
-                best_confidence = confidence
-                issues = detect_issues(event, ref, 'FUZZY', ln_sim, fn_sim)
-                conf_tolerant = calculate_confidence_tolerant(event, ref, ln_sim, fn_sim)
-                best_result = MatchResult(
-                    event_player=event,
-                    ref_player=ref,
-                    match_type='FUZZY',
-                    confidence=confidence,
-                    confidence_tolerant=conf_tolerant,
-                    issues=issues,
-                )
+    players: list[Player]
+    name_index: dict[tuple[str, str], list[Player]]
+    lns: np.ndarray
+    fns: np.ndarray
+    ln_lengths: np.ndarray
+    fn_lengths: np.ndarray
+    ln_masks: np.ndarray
+    fn_masks: np.ndarray
+    arrays: RefArrays
 
-    return best_result
 
+def prepare_ref(ref_players: list[Player]) -> RefState:
+    """Build indexes and column arrays for the reference players.
 
-def match_players(
-    ref_players: list[Player],
-    event_players: list[Player],
-    fuzzy_threshold: float = 0.85,
-) -> list[MatchResult]:
-    """Match event players against the reference database.
+    Args:
+        ref_players: Players from the reference database.
+
+    Returns:
+        RefState to pass to match_with_state.
+    """
+    lns = np.array([p.ln_key for p in ref_players], dtype=object)
+    fns = np.array([p.fn_key for p in ref_players], dtype=object)
+    return RefState(
+        players=ref_players,
+        name_index=_build_name_index(ref_players),
+        lns=lns,
+        fns=fns,
+        ln_lengths=np.array([len(n) for n in lns], dtype=np.int32),
+        fn_lengths=np.array([len(n) for n in fns], dtype=np.int32),
+        ln_masks=_char_masks(lns),
+        fn_masks=_char_masks(fns),
+        arrays=build_ref_arrays(ref_players),
+    )
 
-    Uses a multi-stage approach:
-    1. Exact name match (hash lookup)
-    2. Name-swap detection (hash lookup)
-    3. Fuzzy matching (brute-force with Jaro-Winkler)
-    4. Unmatched → NONE
+
+def _fuzzy_match_batch(
+    events: list[Player],
+    ref: RefState,
+    lastname_threshold: float,
+    firstname_threshold: float,
+) -> list[tuple[MatchResult, float, float] | None]:
+    """Find fuzzy matches for a batch of event players.
+
+    A cheap length/character-set bound first discards reference players
+    that cannot reach the thresholds. Only the remaining candidates are
+    compared with Jaro-Winkler (one ``cdist`` call per event and name
+    field), and the pairs surviving both thresholds are scored in one
+    vectorized ``score_batch`` call.
 
     Args:
-        ref_players: Players from the reference database.
-        event_players: Players from the event file.
-        fuzzy_threshold: Threshold for fuzzy last name matching (0–1 scale).
+        events: Players from the event file that had no exact/swap match.
+        ref: Prepared reference data.
+        lastname_threshold: Minimum similarity for last name (0–1).
+        firstname_threshold: Minimum similarity for first name (0–1).
 
     Returns:
-        List of MatchResult for every event player.
+        Per event player the best MatchResult (without confidence_tolerant)
+        with its last and first name similarities, or None if no fuzzy
+        match is found.
     """
-    name_index = _build_name_index(ref_players)
-    swap_index = _build_swap_index(ref_players)
+    if not events or not ref.players:
+        return [None] * len(events)
+
+    # rapidfuzz's score_cutoff is applied with a margin; the exact
+    # threshold check happens on the returned scores below.
+    ln_cutoff = max(lastname_threshold - _CUTOFF_MARGIN, 0.0)
+    fn_cutoff = max(firstname_threshold - _CUTOFF_MARGIN, 0.0)
+
+    results: list[tuple[MatchResult, float, float] | None] = []
+    for event in events:
+        event_ln = event.ln_key
+        event_fn = event.fn_key
+
+        # Cascade: length/charset bound on last names selects a block of
+        # candidates, the first-name bound only runs within that block
+        candidates = np.flatnonzero(_jaro_winkler_candidates(
+            len(event_ln), _char_masks([event_ln])[0],
+            ref.ln_lengths, ref.ln_masks, ln_cutoff,
+        ))
+        if candidates.size:
+            candidates = candidates[_jaro_winkler_candidates(
+                len(event_fn), _char_masks([event_fn])[0],
+                ref.fn_lengths[candidates], ref.fn_masks[candidates], fn_cutoff,
+            )]
+        if not candidates.size:
+            results.append(None)
+            continue
+
+        # Early exit: first names are only compared for last-name survivors
+        scores_ln = process.cdist(
+            [event_ln], ref.lns[candidates], scorer=JaroWinkler.similarity,
+            score_cutoff=ln_cutoff, dtype=np.float64,
+        )[0]
+        keep = scores_ln >= lastname_threshold
+        if not keep.any():
+            results.append(None)
+            continue
+        candidates = candidates[keep]
+        scores_ln = scores_ln[keep]
+
+        scores_fn = process.cdist(
+            [event_fn], ref.fns[candidates], scorer=JaroWinkler.similarity,
+            score_cutoff=fn_cutoff, dtype=np.float64,
+        )[0]
+        keep = scores_fn >= firstname_threshold
+        if not keep.any():
+            results.append(None)
+            continue
+        candidates = candidates[keep]
+        scores_ln = scores_ln[keep]
+        scores_fn = scores_fn[keep]
+
+        # argmax returns the first maximum, i.e. the lowest ref position wins ties
+        confidences = score_batch(event, scores_ln, scores_fn, ref.arrays, candidates)
+        best = int(np.argmax(confidences))
+        best_ref = ref.players[candidates[best]]
+        ln_sim = float(scores_ln[best])
+        fn_sim = float(scores_fn[best])
+        results.append((MatchResult(
+            event_player=event,
+            ref_player=best_ref,
+            match_type='FUZZY',
+            confidence=int(confidences[best]) / CONFIDENCE_SCALE,
+            issue_bits=detect_issue_bits(event, best_ref, 'FUZZY', ln_sim, fn_sim),
+        ), ln_sim, fn_sim))
 
+    return results
+
+
+def _match_chunk(
+    ref: RefState,
+    event_players: list[Player],
+    fuzzy_threshold: float,
+) -> list[MatchResult]:
+    """Run all matching stages for a chunk of event players."""
     lastname_threshold = fuzzy_threshold
     firstname_threshold = DEFAULT_FIRSTNAME_THRESHOLD
 
-    results: list[MatchResult] = []
+    results: list[MatchResult | None] = []
+    pending: list[int] = []
 
     for event in event_players:
-        event_key = (_normalize_key(event.last_name), _normalize_key(event.first_name))
+        event_key = (event.ln_key, event.fn_key)
 
         # Stage 1: Exact match
-        exact_candidates = name_index.get(event_key)
+        exact_candidates = ref.name_index.get(event_key)
         if exact_candidates:
             result = _pick_best_candidate(event, exact_candidates, 'EXACT', 1.0, 1.0)
             results.append(result)
             continue
 
         # Stage 2: Name-swap match
-        swap_candidates = swap_index.get(event_key)
+        # name_index keyed by (first, last) finds refs with swapped names
+        swap_candidates = ref.name_index.get((event.fn_key, event.ln_key))
         if swap_candidates:
             result = _pick_best_candidate(event, swap_candidates, 'NAME_SWAP', 1.0, 1.0)
             results.append(result)
             continue
 
-        # Stage 3: Fuzzy match
-        fuzzy_result = _try_fuzzy_match(
-            event, ref_players, lastname_threshold, firstname_threshold,
-        )
+        # Stages 3/4 are resolved below for all remaining players at once
+        pending.append(len(results))
+        results.append(None)
+
+    # Stage 3: Fuzzy match
+    fuzzy_results = _fuzzy_match_batch(
+        [event_players[i] for i in pending], ref,
+        lastname_threshold, firstname_threshold,
+    )
+
+    # Name similarities of matched results, for the tolerant scores
+    lastname_sims = [1.0] * len(results)
+    firstname_sims = [1.0] * len(results)
+
+    for i, fuzzy_result in zip(pending, fuzzy_results):
         if fuzzy_result:
-            results.append(fuzzy_result)
+            results[i], lastname_sims[i], firstname_sims[i] = fuzzy_result
             continue
 
         # Stage 4: No match
-        results.append(MatchResult(
-            event_player=event,
+        results[i] = MatchResult(
+            event_player=event_players[i],
             ref_player=None,
             match_type='NONE',
             confidence=0.0,
-            issues=['NO_MATCH'],
-        ))
+            issue_bits=ISSUE_BITS['NO_MATCH'],
+        )
+
+    matched = [i for i, r in enumerate(results) if r.ref_player is not None]
+    tolerant = calculate_confidence_tolerant_batch(
+        [results[i].event_player for i in matched],
+        [results[i].ref_player for i in matched],
+        [lastname_sims[i] for i in matched],
+        [firstname_sims[i] for i in matched],
+    )
+    for i, confidence_tolerant in zip(matched, tolerant):
+        results[i].confidence_tolerant = confidence_tolerant
+
+    return results
+
+
+# Per-process state for parallel matching, set by init_worker
+_worker_ref: RefState | None = None
+_worker_fuzzy_threshold: float = 0.85
+
+
+def init_worker(ref: RefState, fuzzy_threshold: float) -> None:
+    """Receive the prepared reference data once per worker process.
+
+    Used as ``ProcessPoolExecutor`` initializer, both here and for the
+    per-file workers of the CLI batch mode.
+    """
+    global _worker_ref, _worker_fuzzy_threshold
+    _worker_ref = ref
+    _worker_fuzzy_threshold = fuzzy_threshold
+
+
+def worker_state() -> tuple[RefState, float]:
+    """Return the reference data and fuzzy threshold set by init_worker."""
+    assert _worker_ref is not None
+    return _worker_ref, _worker_fuzzy_threshold
+
+
+def _match_chunk_in_worker(event_players: list[Player]) -> list[MatchResult]:
+    """Match a chunk of event players inside a worker process."""
+    ref, fuzzy_threshold = worker_state()
+    return _match_chunk(ref, event_players, fuzzy_threshold)
+
+
+def match_with_state(
+    ref: RefState,
+    event_players: list[Player],
+    fuzzy_threshold: float = 0.85,
+    workers: int = 1,
+) -> list[MatchResult]:
+    """Match event players against prepared reference data.
+
+    Uses a multi-stage approach:
+    1. Exact name match (hash lookup)
+    2. Name-swap detection (hash lookup)
+    3. Fuzzy matching (length/charset filter, then Jaro-Winkler)
+    4. Unmatched → NONE
+
+    With ``workers > 1`` the event players are split into one contiguous
+    chunk per worker process. Result order is preserved, but results
+    produced in worker processes hold copies of the Player objects.
+
+    Args:
+        ref: Reference data from prepare_ref.
+        event_players: Players from the event file.
+        fuzzy_threshold: Threshold for fuzzy last name matching (0–1 scale).
+        workers: Number of worker processes (0 = one per CPU, 1 = no pool).
+
+    Returns:
+        List of MatchResult for every event player.
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(event_players))
+
+    if workers > 1:
+        chunk_size = -(-len(event_players) // workers)
+        chunks = [
+            event_players[i:i + chunk_size]
+            for i in range(0, len(event_players), chunk_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=len(chunks),
+            initializer=init_worker,
+            initargs=(ref, fuzzy_threshold),
+        ) as executor:
+            results = [
+                result
+                for chunk_results in executor.map(_match_chunk_in_worker, chunks)
+                for result in chunk_results
+            ]
+    else:
+        results = _match_chunk(ref, event_players, fuzzy_threshold)
 
     log.info(
         "Matching abgeschlossen: %d Spieler verarbeitet",
         len(results),
     )
     return results
+
+
+def match_players(
+    ref_players: list[Player],
+    event_players: list[Player],
+    fuzzy_threshold: float = 0.85,
+    workers: int = 1,
+) -> list[MatchResult]:
+    """Match event players against the reference database.
+
+    Convenience wrapper around prepare_ref and match_with_state. When
+    matching several event files against the same reference database,
+    call prepare_ref once and use match_with_state instead.
+
+    Args:
+        ref_players: Players from the reference database.
+        event_players: Players from the event file.
+        fuzzy_threshold: Threshold for fuzzy last name matching (0–1 scale).
+        workers: Number of worker processes (0 = one per CPU, 1 = no pool).
+
+    Returns:
+        List of MatchResult for every event player.
+    """
+    return match_with_state(
+        prepare_ref(ref_players), event_players, fuzzy_threshold, workers,
+    )
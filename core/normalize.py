@@ -0,0 +1,115 @@
+"""Name normalization helpers shared by the data model and scoring."""
+
+import unicodedata
+
+# Whitespace and punctuation removed by normalize_for_tolerant_comparison
+_TOLERANT_PUNCTUATION = ' -.,;'
+
+# Code points below this limit are handled by _TOLERANT_TABLE. In that range
+# every combining character is a nonspacing mark (category 'Mn'), so
+# translating character by character gives the same result as NFD + filter.
+_TOLERANT_TABLE_LIMIT = '\u0370'
+
+
+def _strip_marks(text: str) -> str:
+    """Remove diacritics via NFD decomposition and dropping combining marks."""
+    # NFD decomposition: split base characters from combining marks
+    decomposed = unicodedata.normalize('NFD', text)
+    # Remove combining marks (category 'Mn')
+    return ''.join(ch for ch in decomposed if unicodedata.category(ch) != 'Mn')
+
+
+def _build_tolerant_table() -> dict[int, str | None]:
+    """Map Latin letters to their mark-free form and punctuation to nothing."""
+    table: dict[int, str | None] = {ord(ch): None for ch in _TOLERANT_PUNCTUATION}
+    for cp in range(0x80, ord(_TOLERANT_TABLE_LIMIT)):
+        ch = chr(cp)
+        base = _strip_marks(ch)
+        if base != ch:
+            table[cp] = base or None
+    return table
+
+
+_TOLERANT_TABLE = _build_tolerant_table()
+_TOLERANT_DELETE = str.maketrans('', '', _TOLERANT_PUNCTUATION)
+
+# Joins names for batch normalization; untouched by translate and upper()
+_BATCH_SEPARATOR = '\x01'
+
+
+def normalize_key(value: str) -> str:
+    """Normalize a name for hash-index lookup."""
+    return value.strip().upper()
+
+
+# Names repeat a lot across players (first names especially) and event
+# files. A plain dict rather than lru_cache so that prefill_tolerant_cache
+# can fill it in bulk.
+_TOLERANT_CACHE: dict[str, str] = {}
+_TOLERANT_CACHE_SIZE = 65536
+
+
+def _tolerant_uncached(text: str) -> str:
+    """Normalize one name without consulting the cache."""
+    if text.isascii():
+        return text.translate(_TOLERANT_DELETE).upper()
+    if max(text) < _TOLERANT_TABLE_LIMIT:
+        return text.translate(_TOLERANT_TABLE).upper()
+    # Other scripts: full NFD path, then remove whitespace and punctuation
+    return _strip_marks(text).translate(_TOLERANT_DELETE).upper()
+
+
+def normalize_for_tolerant_comparison(text: str) -> str:
+    """Normalize text for tolerant name comparison.
+
+    Removes accents/diacritics via NFD decomposition, strips spaces,
+    hyphens, dots, commas and semicolons, then uppercases. Latin text is
+    handled by a single precomputed ``str.translate`` table; other scripts
+    take the NFD path.
+
+    Args:
+        text: Raw name string.
+
+    Returns:
+        Normalized string for comparison.
+    """
+    try:
+        return _TOLERANT_CACHE[text]
+    except KeyError:
+        pass
+    normalized = _tolerant_uncached(text)
+    if len(_TOLERANT_CACHE) >= _TOLERANT_CACHE_SIZE:
+        _TOLERANT_CACHE.clear()
+    _TOLERANT_CACHE[text] = normalized
+    return normalized
+
+
+def prefill_tolerant_cache(texts: list[str]) -> None:
+    """Add the tolerant forms of many names to the cache at once.
+
+    Uncached ASCII names are joined and normalized in a single
+    translate/upper pass, which avoids most of the per-name call overhead;
+    other names are normalized one by one. Later
+    normalize_for_tolerant_comparison calls for these names are then
+    cache hits. Results do not depend on it: a name evicted in between is
+    simply normalized again.
+
+    Args:
+        texts: Raw name strings.
+    """
+    missing = [text for text in dict.fromkeys(texts) if text not in _TOLERANT_CACHE]
+    ascii_texts = [text for text in missing if text.isascii()]
+    parts = (
+        _BATCH_SEPARATOR.join(ascii_texts).translate(_TOLERANT_DELETE).upper()
+        .split(_BATCH_SEPARATOR)
+    )
+    if len(parts) != len(ascii_texts):
+        # A name contained the separator itself
+        parts = [text.translate(_TOLERANT_DELETE).upper() for text in ascii_texts]
+
+    if len(_TOLERANT_CACHE) + len(missing) > _TOLERANT_CACHE_SIZE:
+        _TOLERANT_CACHE.clear()
+    _TOLERANT_CACHE.update(zip(ascii_texts, parts))
+    _TOLERANT_CACHE.update(
+        (text, _tolerant_uncached(text)) for text in missing if not text.isascii()
+    )
@@ -1,17 +1,20 @@
 """CSV reader with automatic encoding detection and field normalization."""
 
 import csv
-import io
 import logging
-import re
+import sys
+from collections.abc import Iterator
+from operator import itemgetter
 from pathlib import Path
 
 from core import Player
+from core.normalize import prefill_tolerant_cache
 
 log = logging.getLogger(__name__)
 
-# Matches any sequence of whitespace (including Unicode whitespace like U+2006)
-_WHITESPACE_RE = re.compile(r'\s+')
+# DoB/MoB/YoB must lie strictly within +/- this limit: scoring packs them
+# into numpy int32/int64 arrays, which cannot hold arbitrary Python ints
+_BIRTH_FIELD_LIMIT = 2**31
 
 
 def detect_encoding(path: Path) -> str:
@@ -27,6 +30,8 @@ def detect_encoding(path: Path) -> str:
         bom = f.read(2)
     if bom == b'\xff\xfe':
         return 'utf-16-le'
+    if bom == b'\xfe\xff':
+        return 'utf-16-be'
     return 'utf-8-sig'
 
 
@@ -42,13 +47,15 @@ def normalize_whitespace(value: str) -> str:
     Returns:
         Normalized string.
     """
-    return _WHITESPACE_RE.sub(' ', value).strip()
+    # str.split() splits on exactly the characters regex \s matches,
+    # Unicode whitespace like U+2006 included
+    return ' '.join(value.split())
 
 
 def read_players(path: str | Path) -> list[Player]:
     """Read player records from a CSV file.
 
-    Handles UTF-16LE (with BOM) and UTF-8 encoded files automatically.
+    Handles UTF-16LE/BE (with BOM) and UTF-8 encoded files automatically.
     Fields are trimmed and whitespace-normalized.
 
     Args:
@@ -64,44 +71,78 @@ def read_players(path: str | Path) -> list[Player]:
     path = Path(path)
     encoding = detect_encoding(path)
 
-    with open(path, 'r', encoding=encoding) as f:
-        content = f.read()
+    # Rows are parsed straight from the file handle, without first reading
+    # the whole file into memory
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        # utf-8-sig drops the BOM itself, utf-16-le/-be do not
+        if f.read(1) != '\ufeff':
+            f.seek(0)
+        players = _parse_players(csv.reader(f, delimiter='\t'), path)
 
-    # Strip BOM if present
-    content = content.lstrip('\ufeff')
+    log.info("%d Spieler gelesen aus %s", len(players), path)
+    return players
 
-    reader = csv.DictReader(io.StringIO(content), delimiter='\t')
 
+def _parse_players(reader: Iterator[list[str]], path: Path) -> list[Player]:
+    """Validate the header and convert the remaining CSV rows to Players."""
     required_cols = {'Extern ID', 'Last Name', 'First Name', 'Sex',
                      'Association', 'DoB', 'MoB', 'YoB'}
-    if reader.fieldnames is None:
+    header = next(reader, None)
+    if header is None:
         raise ValueError(f"Datei {path} ist leer oder hat keine Header-Zeile.")
-    actual_cols = {normalize_whitespace(c) for c in reader.fieldnames}
-    missing = required_cols - actual_cols
+    # Normalize the header once; rows are then read by column position
+    col_idx = {normalize_whitespace(c): i for i, c in enumerate(header)}
+    missing = required_cols - col_idx.keys()
     if missing:
         raise ValueError(
             f"Fehlende Spalten in {path}: {', '.join(sorted(missing))}"
         )
-
-    players: list[Player] = []
-    for row_num, row in enumerate(reader, start=2):
-        # Normalize keys and values
-        cleaned = {normalize_whitespace(k): normalize_whitespace(v)
-                    for k, v in row.items() if k is not None}
+    # Pulls the required fields out of a row in Player field order
+    extract = itemgetter(
+        col_idx['Extern ID'], col_idx['Last Name'], col_idx['First Name'],
+        col_idx['Sex'], col_idx['Association'],
+        col_idx['DoB'], col_idx['MoB'], col_idx['YoB'],
+    )
+    width = len(header)
+
+    # Repeated names share one string object per file; the low-cardinality
+    # sex/association values are interned globally
+    dedupe = {}.setdefault
+    intern = sys.intern
+
+    records: list[tuple] = []
+    # Blank lines are skipped (as csv.DictReader did)
+    for row_num, row in enumerate(filter(None, reader), start=2):
+        if len(row) < width:
+            row += [''] * (width - len(row))
+        # normalize_whitespace, inlined for the per-cell hot path
+        extern_id, last_name, first_name, sex, association, dob, mob, yob = [
+            ' '.join(value.split()) for value in extract(row)
+        ]
         try:
-            player = Player(
-                extern_id=cleaned.get('Extern ID', ''),
-                last_name=cleaned.get('Last Name', ''),
-                first_name=cleaned.get('First Name', ''),
-                sex=cleaned.get('Sex', ''),
-                association=cleaned.get('Association', ''),
-                dob=int(cleaned['DoB']) if cleaned.get('DoB') else 0,
-                mob=int(cleaned['MoB']) if cleaned.get('MoB') else 0,
-                yob=int(cleaned['YoB']) if cleaned.get('YoB') else 0,
-            )
-            players.append(player)
-        except (ValueError, KeyError) as exc:
+            day = int(dob) if dob else 0
+            month = int(mob) if mob else 0
+            year = int(yob) if yob else 0
+            # Only values of ten or more characters can exceed the limit
+            if (len(dob) > 9 or len(mob) > 9 or len(yob) > 9) and (
+                max(day, month, year) >= _BIRTH_FIELD_LIMIT
+                or min(day, month, year) <= -_BIRTH_FIELD_LIMIT
+            ):
+                raise ValueError(
+                    f"Geburtsdatum ausserhalb des Wertebereichs: {dob}.{mob}.{yob}"
+                )
+            records.append((
+                extern_id,
+                dedupe(last_name, last_name),
+                dedupe(first_name, first_name),
+                intern(sex),
+                intern(association),
+                day, month, year,
+            ))
+        except ValueError as exc:
             log.warning("Zeile %d in %s uebersprungen: %s", row_num, path, exc)
 
-    log.info("%d Spieler gelesen aus %s", len(players), path)
-    return players
+    # Tolerant name forms for the whole file in one batch, so that
+    # Player.__post_init__ finds them in the cache
+    prefill_tolerant_cache([r[1] for r in records] + [r[2] for r in records])
+    return [Player(*record) for record in records]
@@ -2,11 +2,14 @@
 
 import csv
 import logging
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
+import numpy as np
+from jinja2 import Environment, FileSystemLoader, Template
 
-from core import MatchResult
+from core import ISSUE_BITS, MatchResult
 
 log = logging.getLogger(__name__)
 
@@ -36,34 +39,34 @@ CSV_COLUMNS = [
 ]
 
 
-def _result_to_row(result: MatchResult) -> dict:
-    """Convert a MatchResult to a flat dict for CSV/HTML output."""
+def _result_to_tuple(result: MatchResult) -> tuple[str, ...]:
+    """Convert a MatchResult to a flat tuple in CSV_COLUMNS order."""
     ep = result.event_player
     ref = result.ref_player
-    return {
-        'Event_ExternID': ep.extern_id,
-        'Event_LastName': ep.last_name,
-        'Event_FirstName': ep.first_name,
-        'Event_Sex': ep.sex,
-        'Event_Association': ep.association,
-        'Event_DoB': str(ep.dob),
-        'Event_MoB': str(ep.mob),
-        'Event_YoB': str(ep.yob),
-        'Ref_ExternID': ref.extern_id if ref else '',
-        'Ref_LastName': ref.last_name if ref else '',
-        'Ref_FirstName': ref.first_name if ref else '',
-        'Ref_Sex': ref.sex if ref else '',
-        'Ref_Association': ref.association if ref else '',
-        'Ref_DoB': str(ref.dob) if ref else '',
-        'Ref_MoB': str(ref.mob) if ref else '',
-        'Ref_YoB': str(ref.yob) if ref else '',
-        'Match_Type': result.match_type,
-        'Confidence': f'{result.confidence:.4f}',
-        'Confidence_Tolerant': f'{result.confidence_tolerant:.4f}',
-        'Issues': ', '.join(result.issues),
-        # Set of issue codes for targeted cell highlighting in HTML
-        '_issues': set(result.issues),
-    }
+    if ref:
+        ref_fields = (
+            ref.extern_id, ref.last_name, ref.first_name, ref.sex,
+            ref.association, str(ref.dob), str(ref.mob), str(ref.yob),
+        )
+    else:
+        ref_fields = ('',) * 8
+    return (
+        ep.extern_id, ep.last_name, ep.first_name, ep.sex,
+        ep.association, str(ep.dob), str(ep.mob), str(ep.yob),
+        *ref_fields,
+        result.match_type,
+        f'{result.confidence:.4f}',
+        f'{result.confidence_tolerant:.4f}',
+        ', '.join(result.issues),
+    )
+
+
+def _result_to_row(result: MatchResult) -> dict:
+    """Convert a MatchResult to a flat dict for HTML output."""
+    row = dict(zip(CSV_COLUMNS, _result_to_tuple(result)))
+    # Set of issue codes for targeted cell highlighting in HTML
+    row['_issues'] = set(result.issues)
+    return row
 
 
 def write_csv_report(results: list[MatchResult], output_path: Path) -> None:
@@ -80,16 +83,23 @@ def write_csv_report(results: list[MatchResult], output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(
-            f, fieldnames=CSV_COLUMNS, delimiter=';', extrasaction='ignore',
-        )
-        writer.writeheader()
-        for result in results:
-            writer.writerow(_result_to_row(result))
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(_result_to_tuple(r) for r in results)
 
     log.info("CSV-Report geschrieben: %s (%d Zeilen)", output_path, len(results))
 
 
+@lru_cache(maxsize=1)
+def _get_html_template() -> Template:
+    """Load and compile the HTML report template once per process."""
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=True,
+    )
+    return env.get_template('report.html')
+
+
 def write_html_report(
     results: list[MatchResult],
     output_path: Path,
@@ -105,11 +115,7 @@ def write_html_report(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    env = Environment(
-        loader=FileSystemLoader(str(TEMPLATE_DIR)),
-        autoescape=True,
-    )
-    template = env.get_template('report.html')
+    template = _get_html_template()
 
     rows = [_result_to_row(r) for r in results]
     stats = _compute_stats(results)
@@ -127,55 +133,67 @@ def write_html_report(
 
 def _compute_stats(results: list[MatchResult]) -> dict:
     """Compute summary statistics from match results."""
-    total = len(results)
-    exact = sum(1 for r in results if r.match_type == 'EXACT')
-    name_swap = sum(1 for r in results if r.match_type == 'NAME_SWAP')
-    fuzzy = sum(1 for r in results if r.match_type == 'FUZZY')
-    none = sum(1 for r in results if r.match_type == 'NONE')
+    type_counts = Counter(r.match_type for r in results)
+    bits = np.fromiter((r.issue_bits for r in results), dtype=np.uint16, count=len(results))
+
+    def count(code: str) -> int:
+        return int(np.count_nonzero(bits & ISSUE_BITS[code]))
 
-    all_issues = []
-    for r in results:
-        all_issues.extend(r.issues)
+    # Results carrying any issue other than a lone NO_MATCH
+    issues_total = int(np.count_nonzero((bits != 0) & (bits != ISSUE_BITS['NO_MATCH'])))
 
     return {
-        'total': total,
-        'exact': exact,
-        'name_swap': name_swap,
-        'fuzzy': fuzzy,
-        'none': none,
-        'dob_mob_swapped': all_issues.count('DOB_MOB_SWAPPED'),
-        'dob_mismatch': all_issues.count('DOB_MISMATCH'),
-        'mob_mismatch': all_issues.count('MOB_MISMATCH'),
-        'yob_mismatch': all_issues.count('YOB_MISMATCH'),
-        'sex_mismatch': all_issues.count('SEX_MISMATCH'),
-        'assoc_mismatch': all_issues.count('ASSOC_MISMATCH'),
-        'issues_total': sum(
-            1 for r in results if r.issues and r.issues != ['NO_MATCH']
-        ),
+        'total': len(results),
+        'exact': type_counts['EXACT'],
+        'name_swap': type_counts['NAME_SWAP'],
+        'fuzzy': type_counts['FUZZY'],
+        'none': type_counts['NONE'],
+        'dob_mob_swapped': count('DOB_MOB_SWAPPED'),
+        'dob_mismatch': count('DOB_MISMATCH'),
+        'mob_mismatch': count('MOB_MISMATCH'),
+        'yob_mismatch': count('YOB_MISMATCH'),
+        'sex_mismatch': count('SEX_MISMATCH'),
+        'assoc_mismatch': count('ASSOC_MISMATCH'),
+        'issues_total': issues_total,
     }
 
 
-def print_summary(results: list[MatchResult], event_name: str = '') -> None:
-    """Print a summary of match results to stdout.
+def format_summary(results: list[MatchResult], event_name: str = '') -> str:
+    """Format a summary of match results as printable text.
 
     Args:
         results: List of match results.
         event_name: Name of the event file.
+
+    Returns:
+        Multi-line summary text.
     """
     stats = _compute_stats(results)
 
-    print(f"\n=== Match-Report: {event_name} ===")
-    print(f"Gesamt Event-Eintraege:    {stats['total']:>5}")
-    print(f"Exakte Matches:            {stats['exact']:>5}")
-    print(f"Name-Swaps erkannt:        {stats['name_swap']:>5}")
-    print(f"Fuzzy Matches:             {stats['fuzzy']:>5}")
-    print(f"DoB/MoB vertauscht:        {stats['dob_mob_swapped']:>5}")
-    print(f"Kein Match gefunden:       {stats['none']:>5}")
-    print("---")
-    print(f"Fehler gesamt:             {stats['issues_total']:>5}")
-    print(f"  - Geburtstag falsch:     {stats['dob_mismatch']:>5}")
-    print(f"  - Monat falsch:          {stats['mob_mismatch']:>5}")
-    print(f"  - Jahr falsch:           {stats['yob_mismatch']:>5}")
-    print(f"  - Nationalitaet falsch:  {stats['assoc_mismatch']:>5}")
-    print(f"  - Geschlecht falsch:     {stats['sex_mismatch']:>5}")
-    print()
+    return '\n'.join([
+        f"\n=== Match-Report: {event_name} ===",
+        f"Gesamt Event-Eintraege:    {stats['total']:>5}",
+        f"Exakte Matches:            {stats['exact']:>5}",
+        f"Name-Swaps erkannt:        {stats['name_swap']:>5}",
+        f"Fuzzy Matches:             {stats['fuzzy']:>5}",
+        f"DoB/MoB vertauscht:        {stats['dob_mob_swapped']:>5}",
+        f"Kein Match gefunden:       {stats['none']:>5}",
+        "---",
+        f"Fehler gesamt:             {stats['issues_total']:>5}",
+        f"  - Geburtstag falsch:     {stats['dob_mismatch']:>5}",
+        f"  - Monat falsch:          {stats['mob_mismatch']:>5}",
+        f"  - Jahr falsch:           {stats['yob_mismatch']:>5}",
+        f"  - Nationalitaet falsch:  {stats['assoc_mismatch']:>5}",
+        f"  - Geschlecht falsch:     {stats['sex_mismatch']:>5}",
+        "",
+    ])
+
+
+def print_summary(results: list[MatchResult], event_name: str = '') -> None:
+    """Print a summary of match results to stdout.
+
+    Args:
+        results: List of match results.
+        event_name: Name of the event file.
+    """
+    print(format_summary(results, event_name))
@@ -1,10 +1,14 @@
 """Confidence scoring and issue detection for player matches."""
 
-import unicodedata
+from dataclasses import dataclass
 
+import numpy as np
+from rapidfuzz import process
 from rapidfuzz.distance import JaroWinkler
 
-from core import Player
+from core import ISSUE_BITS, Player, issue_codes
+# Re-exported as part of the scoring API
+from core.normalize import normalize_for_tolerant_comparison
 
 WEIGHTS: dict[str, float] = {
     'lastname': 0.30,
@@ -16,6 +20,32 @@ WEIGHTS: dict[str, float] = {
     'association': 0.05,
 }
 
+# Confidences are computed as integers in units of 1 / CONFIDENCE_SCALE,
+# which matches the 4-decimal precision of the reports
+CONFIDENCE_SCALE = 10_000
+WEIGHT_UNITS: dict[str, int] = {
+    key: round(weight * CONFIDENCE_SCALE) for key, weight in WEIGHTS.items()
+}
+_LN_UNITS = WEIGHT_UNITS['lastname']
+_FN_UNITS = WEIGHT_UNITS['firstname']
+_DOB_UNITS = WEIGHT_UNITS['dob']
+_MOB_UNITS = WEIGHT_UNITS['mob']
+_YOB_UNITS = WEIGHT_UNITS['yob']
+_SEX_UNITS = WEIGHT_UNITS['sex']
+_ASSOC_UNITS = WEIGHT_UNITS['association']
+_BIRTH_UNITS = _DOB_UNITS + _MOB_UNITS + _YOB_UNITS
+
+# Bound once so detect_issue_bits avoids dict lookups
+_NAME_SWAPPED = ISSUE_BITS['NAME_SWAPPED']
+_LASTNAME_FUZZY = ISSUE_BITS['LASTNAME_FUZZY']
+_FIRSTNAME_FUZZY = ISSUE_BITS['FIRSTNAME_FUZZY']
+_DOB_MOB_SWAPPED = ISSUE_BITS['DOB_MOB_SWAPPED']
+_DOB_MISMATCH = ISSUE_BITS['DOB_MISMATCH']
+_MOB_MISMATCH = ISSUE_BITS['MOB_MISMATCH']
+_YOB_MISMATCH = ISSUE_BITS['YOB_MISMATCH']
+_SEX_MISMATCH = ISSUE_BITS['SEX_MISMATCH']
+_ASSOC_MISMATCH = ISSUE_BITS['ASSOC_MISMATCH']
+
 
 def is_dob_mob_swapped(event: Player, ref: Player) -> bool:
     """Check if day and month of birth are swapped between event and ref.
@@ -29,12 +59,49 @@ def is_dob_mob_swapped(event: Player, ref: Player) -> bool:
     Returns:
         True if DoB and MoB appear to be swapped.
     """
-    return (
-        event.dob == ref.mob
-        and event.mob == ref.dob
-        and event.yob == ref.yob
-        and event.dob != event.mob  # Guard: only flag when swap changes values
-    )
+    # swap_key is None for day == month; equal keys mean the event has the
+    # ref's day and month exchanged, so the guard holds for both players
+    return event.birth_key == ref.swap_key
+
+
+def confidence_units(
+    event: Player,
+    ref: Player,
+    lastname_sim: float,
+    firstname_sim: float,
+) -> int:
+    """Calculate the confidence score for a match in integer units.
+
+    A detected DoB/MoB swap is treated as a correct match (same as NAME_SWAP),
+    so both dob and mob contribute their full weight to the score. Only the
+    similarity part needs rounding; all other terms are integer weights.
+
+    Args:
+        event: Player from the event file.
+        ref: Player from the reference database.
+        lastname_sim: Jaro-Winkler similarity for last name (0.0–1.0).
+        firstname_sim: Jaro-Winkler similarity for first name (0.0–1.0).
+
+    Returns:
+        Confidence score between 0 and CONFIDENCE_SCALE.
+    """
+    # Half-unit ties round up, as in the reports' 4-decimal notation
+    score = int(_LN_UNITS * lastname_sim + _FN_UNITS * firstname_sim + 0.5)
+    # A swap implies the same year, so it scores like an identical date
+    if event.birth_key == ref.birth_key or is_dob_mob_swapped(event, ref):
+        score += _BIRTH_UNITS
+    else:
+        if event.dob == ref.dob:
+            score += _DOB_UNITS
+        if event.mob == ref.mob:
+            score += _MOB_UNITS
+        if event.yob == ref.yob:
+            score += _YOB_UNITS
+    if event.sex_key == ref.sex_key:
+        score += _SEX_UNITS
+    if event.assoc_key == ref.assoc_key:
+        score += _ASSOC_UNITS
+    return score
 
 
 def calculate_confidence(
@@ -45,9 +112,6 @@ def calculate_confidence(
 ) -> float:
     """Calculate the confidence score for a match.
 
-    A detected DoB/MoB swap is treated as a correct match (same as NAME_SWAP),
-    so both dob and mob contribute their full weight to the score.
-
     Args:
         event: Player from the event file.
         ref: Player from the reference database.
@@ -55,41 +119,120 @@ def calculate_confidence(
         firstname_sim: Jaro-Winkler similarity for first name (0.0–1.0).
 
     Returns:
-        Confidence score between 0.0 and 1.0.
+        Confidence score between 0.0 and 1.0 (4 decimals).
+    """
+    return confidence_units(event, ref, lastname_sim, firstname_sim) / CONFIDENCE_SCALE
+
+
+# Column order of RefArrays.fields
+_DOB_COL, _MOB_COL, _YOB_COL, _SEX_COL, _ASSOC_COL = range(5)
+_FIELD_UNITS = np.array(
+    [_DOB_UNITS, _MOB_UNITS, _YOB_UNITS, _SEX_UNITS, _ASSOC_UNITS], dtype=np.int32,
+)
+
+
+@dataclass
+class RefArrays:
+    """Column-wise (struct-of-arrays) view of reference players for batch scoring.
+
+    ``fields`` holds one row per player with the columns dob, mob, yob, sex
+    and association, so a batch of candidates is gathered in a single
+    indexing step. It uses int16 unless a value needs a wider type. Sex and
+    association are encoded as integer codes; ``sex_codes`` and
+    ``assoc_codes`` map the uppercase values to those codes.
+    """
+
+    fields: np.ndarray
+    sex_codes: dict[str, int]
+    assoc_codes: dict[str, int]
+
+
+def build_ref_arrays(players: list[Player]) -> RefArrays:
+    """Convert reference players into column arrays for score_batch.
+
+    Args:
+        players: Players from the reference database.
+
+    Returns:
+        RefArrays with one row per player, in list order.
     """
-    dob_swapped = is_dob_mob_swapped(event, ref)
-    score = (
-        WEIGHTS['lastname'] * lastname_sim
-        + WEIGHTS['firstname'] * firstname_sim
-        + WEIGHTS['dob'] * (1.0 if event.dob == ref.dob or dob_swapped else 0.0)
-        + WEIGHTS['mob'] * (1.0 if event.mob == ref.mob or dob_swapped else 0.0)
-        + WEIGHTS['yob'] * (1.0 if event.yob == ref.yob else 0.0)
-        + WEIGHTS['sex'] * (1.0 if event.sex.upper() == ref.sex.upper() else 0.0)
-        + WEIGHTS['association'] * (1.0 if event.association.upper() == ref.association.upper() else 0.0)
+    sex_codes: dict[str, int] = {}
+    assoc_codes: dict[str, int] = {}
+    fields = np.array(
+        [
+            (
+                p.dob, p.mob, p.yob,
+                sex_codes.setdefault(p.sex_key, len(sex_codes)),
+                assoc_codes.setdefault(p.assoc_key, len(assoc_codes)),
+            )
+            for p in players
+        ],
+        dtype=np.int64,
+    ).reshape(len(players), 5)
+    return RefArrays(
+        fields=_narrowest_int(fields), sex_codes=sex_codes, assoc_codes=assoc_codes,
     )
-    return round(score, 4)
 
 
-def normalize_for_tolerant_comparison(text: str) -> str:
-    """Normalize text for tolerant name comparison.
+def _narrowest_int(values: np.ndarray) -> np.ndarray:
+    """Downcast to the smallest of int16/int32 that holds all values."""
+    if not values.size:
+        return values.astype(np.int16)
+    low, high = values.min(), values.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
 
-    Removes accents/diacritics via NFD decomposition, strips spaces,
-    hyphens, dots, commas and semicolons, then uppercases.
+
+def score_batch(
+    event: Player,
+    lastname_sims: np.ndarray,
+    firstname_sims: np.ndarray,
+    ref_arrays: RefArrays,
+    indices: np.ndarray,
+) -> np.ndarray:
+    """Calculate confidence scores of one event player against many refs.
+
+    Vectorized equivalent of confidence_units: same weights, same
+    DoB/MoB swap handling and the same rounding. All field comparisons
+    run as one element-wise compare against the event's row, weighted by
+    a single matrix product.
 
     Args:
-        text: Raw name string.
+        event: Player from the event file.
+        lastname_sims: Last name similarities, aligned with ``indices``.
+        firstname_sims: First name similarities, aligned with ``indices``.
+        ref_arrays: Column arrays of the reference players.
+        indices: Positions of the scored players in ``ref_arrays``.
 
     Returns:
-        Normalized string for comparison.
+        int32 array of confidence scores in units of 1 / CONFIDENCE_SCALE.
     """
-    # NFD decomposition: split base characters from combining marks
-    decomposed = unicodedata.normalize('NFD', text)
-    # Remove combining marks (category 'Mn')
-    stripped = ''.join(ch for ch in decomposed if unicodedata.category(ch) != 'Mn')
-    # Remove whitespace and punctuation characters
-    for ch in (' ', '-', '.', ',', ';'):
-        stripped = stripped.replace(ch, '')
-    return stripped.upper()
+    ref_fields = ref_arrays.fields[indices]
+    # int64, so event values outside the (narrower) ref dtype cannot wrap
+    event_fields = np.array(
+        [
+            event.dob, event.mob, event.yob,
+            ref_arrays.sex_codes.get(event.sex_key, -1),
+            ref_arrays.assoc_codes.get(event.assoc_key, -1),
+        ],
+        dtype=np.int64,
+    )
+    equal = ref_fields == event_fields
+
+    # A DoB/MoB swap counts as matching day and month
+    if event.dob != event.mob:
+        dob_swapped = (
+            (ref_fields[:, _MOB_COL] == event.dob)
+            & (ref_fields[:, _DOB_COL] == event.mob)
+            & equal[:, _YOB_COL]
+        )
+        equal[dob_swapped, _DOB_COL:_MOB_COL + 1] = True
+
+    score = np.floor(_LN_UNITS * lastname_sims + _FN_UNITS * firstname_sims + 0.5).astype(np.int32)
+    return score + equal @ _FIELD_UNITS
 
 
 def calculate_confidence_tolerant(
@@ -101,7 +244,8 @@ def calculate_confidence_tolerant(
     """Calculate tolerant confidence score using accent-/punctuation-normalized names.
 
     If normalized names are identical, similarity is set to 1.0.
-    Otherwise falls back to Jaro-Winkler on the normalized forms.
+    Otherwise falls back to Jaro-Winkler on the normalized forms. The
+    normalized forms are precomputed on each Player (``ln_tol``/``fn_tol``).
 
     Args:
         event: Player from the event file.
@@ -112,41 +256,86 @@ def calculate_confidence_tolerant(
     Returns:
         Tolerant confidence score between 0.0 and 1.0.
     """
-    norm_event_ln = normalize_for_tolerant_comparison(event.last_name)
-    norm_ref_ln = normalize_for_tolerant_comparison(ref.last_name)
-    norm_event_fn = normalize_for_tolerant_comparison(event.first_name)
-    norm_ref_fn = normalize_for_tolerant_comparison(ref.first_name)
+    norm_event_ln = event.ln_tol
+    norm_ref_ln = ref.ln_tol
+    norm_event_fn = event.fn_tol
+    norm_ref_fn = ref.fn_tol
 
-    if norm_event_ln == norm_ref_ln:
+    # A similarity of 1.0 cannot be raised, so Jaro-Winkler is skipped then
+    if norm_event_ln == norm_ref_ln or lastname_sim >= 1.0:
         ln_sim_t = 1.0
     else:
         ln_sim_t = max(lastname_sim, JaroWinkler.similarity(norm_event_ln, norm_ref_ln))
 
-    if norm_event_fn == norm_ref_fn:
+    if norm_event_fn == norm_ref_fn or firstname_sim >= 1.0:
         fn_sim_t = 1.0
     else:
         fn_sim_t = max(firstname_sim, JaroWinkler.similarity(norm_event_fn, norm_ref_fn))
 
-    dob_swapped = is_dob_mob_swapped(event, ref)
-    score = (
-        WEIGHTS['lastname'] * ln_sim_t
-        + WEIGHTS['firstname'] * fn_sim_t
-        + WEIGHTS['dob'] * (1.0 if event.dob == ref.dob or dob_swapped else 0.0)
-        + WEIGHTS['mob'] * (1.0 if event.mob == ref.mob or dob_swapped else 0.0)
-        + WEIGHTS['yob'] * (1.0 if event.yob == ref.yob else 0.0)
-        + WEIGHTS['sex'] * (1.0 if event.sex.upper() == ref.sex.upper() else 0.0)
-        + WEIGHTS['association'] * (1.0 if event.association.upper() == ref.association.upper() else 0.0)
+    return calculate_confidence(event, ref, ln_sim_t, fn_sim_t)
+
+
+def _tolerant_similarities(
+    event_names: list[str],
+    ref_names: list[str],
+    sims: list[float],
+) -> list[float]:
+    """Tolerant similarities for aligned name pairs (see calculate_confidence_tolerant)."""
+    result = [1.0] * len(sims)
+    differ = [
+        i for i, (a, b, sim) in enumerate(zip(event_names, ref_names, sims))
+        if sim < 1.0 and a != b
+    ]
+    if differ:
+        scores = process.cpdist(
+            [event_names[i] for i in differ], [ref_names[i] for i in differ],
+            scorer=JaroWinkler.similarity, dtype=np.float64,
+        )
+        for i, score in zip(differ, scores.tolist()):
+            result[i] = max(sims[i], score)
+    return result
+
+
+def calculate_confidence_tolerant_batch(
+    events: list[Player],
+    refs: list[Player],
+    lastname_sims: list[float],
+    firstname_sims: list[float],
+) -> list[float]:
+    """Calculate tolerant confidence scores for aligned event/ref pairs.
+
+    Batch equivalent of calculate_confidence_tolerant: the Jaro-Winkler
+    similarities of differing normalized names are computed with one
+    rapidfuzz call per name field instead of one call per pair.
+
+    Args:
+        events: Players from the event file.
+        refs: Matched reference players, aligned with ``events``.
+        lastname_sims: Original Jaro-Winkler similarities for last name.
+        firstname_sims: Original Jaro-Winkler similarities for first name.
+
+    Returns:
+        List of tolerant confidence scores between 0.0 and 1.0.
+    """
+    ln_sims_t = _tolerant_similarities(
+        [e.ln_tol for e in events], [r.ln_tol for r in refs], lastname_sims,
     )
-    return round(score, 4)
+    fn_sims_t = _tolerant_similarities(
+        [e.fn_tol for e in events], [r.fn_tol for r in refs], firstname_sims,
+    )
+    return [
+        calculate_confidence(event, ref, ln_sim, fn_sim)
+        for event, ref, ln_sim, fn_sim in zip(events, refs, ln_sims_t, fn_sims_t)
+    ]
 
 
-def detect_issues(
+def detect_issue_bits(
     event: Player,
     ref: Player,
     match_type: str,
     lastname_sim: float,
     firstname_sim: float,
-) -> list[str]:
+) -> int:
     """Detect all issues between an event player and a reference player.
 
     Args:
@@ -157,36 +346,54 @@ def detect_issues(
         firstname_sim: Jaro-Winkler similarity for first name (0.0–1.0).
 
     Returns:
-        List of issue codes.
+        Bitmap of ISSUE_BITS values.
     """
-    issues: list[str] = []
+    bits = 0
 
     if match_type == 'NAME_SWAP':
-        issues.append('NAME_SWAPPED')
+        bits |= _NAME_SWAPPED
 
     if lastname_sim < 1.0 and match_type == 'FUZZY':
-        issues.append('LASTNAME_FUZZY')
+        bits |= _LASTNAME_FUZZY
 
     if firstname_sim < 1.0 and match_type == 'FUZZY':
-        issues.append('FIRSTNAME_FUZZY')
+        bits |= _FIRSTNAME_FUZZY
 
-    # DoB/MoB swap detection
-    if is_dob_mob_swapped(event, ref):
-        issues.append('DOB_MOB_SWAPPED')
+    # DoB/MoB swap detection; a swap implies the same year
+    if event.birth_key == ref.birth_key:
+        pass
+    elif is_dob_mob_swapped(event, ref):
+        bits |= _DOB_MOB_SWAPPED
     else:
         # Only report individual mismatches if NOT a swap
         if event.dob != ref.dob:
-            issues.append('DOB_MISMATCH')
+            bits |= _DOB_MISMATCH
         if event.mob != ref.mob:
-            issues.append('MOB_MISMATCH')
+            bits |= _MOB_MISMATCH
+        if event.yob != ref.yob:
+            bits |= _YOB_MISMATCH
+
+    if event.sex_key != ref.sex_key:
+        bits |= _SEX_MISMATCH
+
+    if event.assoc_key != ref.assoc_key:
+        bits |= _ASSOC_MISMATCH
 
-    if event.yob != ref.yob:
-        issues.append('YOB_MISMATCH')
+    return bits
 
-    if event.sex.upper() != ref.sex.upper():
-        issues.append('SEX_MISMATCH')
 
-    if event.association.upper() != ref.association.upper():
-        issues.append('ASSOC_MISMATCH')
+def detect_issues(
+    event: Player,
+    ref: Player,
+    match_type: str,
+    lastname_sim: float,
+    firstname_sim: float,
+) -> list[str]:
+    """Detect all issues between an event player and a reference player.
+
+    Same as detect_issue_bits, but returns the issue codes as strings.
 
-    return issues
+    Returns:
+        List of issue codes.
+    """
+    return issue_codes(detect_issue_bits(event, ref, match_type, lastname_sim, firstname_sim))
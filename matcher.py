@@ -2,12 +2,16 @@
 
 import argparse
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from core.reader import read_players
-from core.matching import match_players
-from core.reporter import write_csv_report, write_html_report, print_summary
+from core.matching import (
+    RefState, init_worker, match_with_state, prepare_ref, worker_state,
+)
+from core.reporter import write_csv_report, write_html_report, format_summary
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -48,20 +52,30 @@ def build_parser() -> argparse.ArgumentParser:
         '--fuzzy-threshold', type=float, default=0.85,
         help='Schwellenwert fuer Fuzzy-Matching (Standard: 0.85)',
     )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Anzahl paralleler Prozesse (Batch-Modus: pro Event-Datei, '
+             'sonst pro Event-Block; 0 = alle CPUs, Standard: 1)',
+    )
     return parser
 
 
 def process_single_event(
-    ref_players: list,
+    ref_state: RefState,
     event_path: Path,
     output_path: Path,
     html: bool,
     summary: bool,
     fuzzy_threshold: float,
-) -> None:
-    """Process a single event file against the reference database."""
+    workers: int = 1,
+) -> str:
+    """Process a single event file against the reference database.
+
+    Returns:
+        Summary text if ``summary`` is set, otherwise an empty string.
+    """
     event_players = read_players(event_path)
-    results = match_players(ref_players, event_players, fuzzy_threshold)
+    results = match_with_state(ref_state, event_players, fuzzy_threshold, workers)
 
     write_csv_report(results, output_path)
     logging.info("CSV-Report geschrieben: %s", output_path)
@@ -71,8 +85,20 @@ def process_single_event(
         write_html_report(results, html_path, event_path.stem)
         logging.info("HTML-Report geschrieben: %s", html_path)
 
-    if summary:
-        print_summary(results, event_path.name)
+    return format_summary(results, event_path.name) if summary else ''
+
+
+def _process_event_in_worker(
+    event_path: Path,
+    output_path: Path,
+    html: bool,
+    summary: bool,
+) -> str:
+    """Process one event file inside a batch worker process."""
+    ref_state, fuzzy_threshold = worker_state()
+    return process_single_event(
+        ref_state, event_path, output_path, html, summary, fuzzy_threshold,
+    )
 
 
 def main() -> None:
@@ -94,13 +120,16 @@ def main() -> None:
     if args.event_dir and not args.output_dir:
         parser.error('--output-dir ist erforderlich bei Verwendung von --event-dir.')
 
-    ref_players = read_players(args.ref)
+    # Indexes over the reference data are built once and reused per event file
+    ref_state = prepare_ref(read_players(args.ref))
 
     if args.event:
-        process_single_event(
-            ref_players, args.event, args.output,
-            args.html, args.summary, args.fuzzy_threshold,
+        summary_text = process_single_event(
+            ref_state, args.event, args.output,
+            args.html, args.summary, args.fuzzy_threshold, args.workers,
         )
+        if summary_text:
+            print(summary_text)
     elif args.event_dir:
         args.output_dir.mkdir(parents=True, exist_ok=True)
         csv_files = sorted(args.event_dir.glob('*.csv'))
@@ -112,13 +141,49 @@ def main() -> None:
             logging.warning("Keine CSV-Dateien in %s gefunden.", args.event_dir)
             return
 
-        for event_path in csv_files:
-            output_path = args.output_dir / f"report_{event_path.stem}.csv"
-            logging.info("Verarbeite %s ...", event_path.name)
-            process_single_event(
-                ref_players, event_path, output_path,
-                args.html, args.summary, args.fuzzy_threshold,
-            )
+        jobs = [
+            (event_path, args.output_dir / f"report_{event_path.stem}.csv")
+            for event_path in csv_files
+        ]
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        workers = min(workers, len(jobs))
+
+        if workers == 1:
+            # A single event file can still be matched in parallel itself
+            file_workers = args.workers if len(jobs) == 1 else 1
+            for event_path, output_path in jobs:
+                logging.info("Verarbeite %s ...", event_path.name)
+                summary_text = process_single_event(
+                    ref_state, event_path, output_path,
+                    args.html, args.summary, args.fuzzy_threshold, file_workers,
+                )
+                if summary_text:
+                    print(summary_text)
+            return
+
+        # Event files are independent: one file per worker process, each
+        # matched in-process against a per-worker copy of the reference data
+        logging.info("Verarbeite %d Dateien mit %d Prozessen ...", len(jobs), workers)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(ref_state, args.fuzzy_threshold),
+        ) as executor:
+            futures = []
+            for event_path, output_path in jobs:
+                future = executor.submit(
+                    _process_event_in_worker, event_path, output_path,
+                    args.html, args.summary,
+                )
+                future.add_done_callback(
+                    lambda _, name=event_path.name: logging.info("Fertig: %s", name)
+                )
+                futures.append(future)
+            # Summaries in file order, as in sequential mode
+            for future in futures:
+                summary_text = future.result()
+                if summary_text:
+                    print(summary_text)
 
 
 if __name__ == '__main__':
@@ -3,7 +3,7 @@
 import pytest
 
 from core import Player, MatchResult
-from core.matching import match_players
+from core.matching import match_players, match_with_state, prepare_ref
 
 
 def _player(**kwargs) -> Player:
@@ -62,6 +62,46 @@ class TestFuzzyMatch:
         assert results[0].match_type == 'FUZZY'
         assert 'LASTNAME_FUZZY' in results[0].issues
 
+    def test_fuzzy_match_typo_in_first_letter(self):
+        ref = [_player(last_name='MUELLER')]
+        event = [_player(last_name='NUELLER', extern_id='E001')]
+        results = match_players(ref, event)
+        assert results[0].match_type == 'FUZZY'
+
+    def test_fuzzy_match_without_shared_trigrams(self):
+        # Transposed letters: no common trigram, Jaro-Winkler 0.917
+        ref = [_player(last_name='LIAN')]
+        event = [_player(last_name='ILAN', extern_id='E001')]
+        results = match_players(ref, event)
+        assert results[0].match_type == 'FUZZY'
+
+    def test_fuzzy_match_on_threshold_boundary(self):
+        # Jaro-Winkler('OOAN', 'OUAN') lies exactly on the 0.85 threshold
+        ref = [_player(last_name='OUAN')]
+        event = [_player(last_name='OOAN', extern_id='E001')]
+        results = match_players(ref, event)
+        assert results[0].match_type == 'FUZZY'
+
+    def test_fuzzy_near_tie_goes_to_first_ref(self):
+        # The weighted name similarities differ by less than one unit
+        # (5303.94 vs 5304.17 of 10000) and round to the same confidence,
+        # so the earlier reference player wins in either order
+        event = [_player(extern_id='E001', last_name='MUELLERMANN', first_name='JOHANNES')]
+        first = _player(extern_id='P001', last_name='MUEILLERMANN', first_name='JOHEANNES')
+        second = _player(extern_id='P002', last_name='MUELTLERMANN', first_name='JOHTNNES')
+        forward = match_players([first, second], event)[0]
+        backward = match_players([second, first], event)[0]
+        assert forward.confidence == backward.confidence
+        assert forward.ref_player.extern_id == 'P001'
+        assert backward.ref_player.extern_id == 'P002'
+
+    def test_overlong_event_name(self):
+        # Longer than 255 characters: the length bound must not wrap in uint8
+        ref = [_player()]
+        event = [_player(last_name='MULLER', first_name='H' * 256, extern_id='E001')]
+        results = match_players(ref, event)
+        assert results[0].match_type == 'NONE'
+
     def test_no_match_below_threshold(self):
         ref = [_player(last_name='COMPLETELY_DIFFERENT')]
         event = [_player(last_name='XYZ_SOMETHING', extern_id='E001')]
@@ -96,6 +136,39 @@ class TestDobMobSwap:
         assert 'DOB_MOB_SWAPPED' in results[0].issues
 
 
+class TestPreparedReference:
+    """Tests for reusing prepared reference data."""
+
+    def test_state_reusable_across_event_files(self):
+        ref = [_player(), _player(extern_id='P002', last_name='SIMON', first_name='Csaba')]
+        state = prepare_ref(ref)
+        first = match_with_state(state, [_player(extern_id='E001')])
+        second = match_with_state(state, [_player(extern_id='E002', last_name='MULLER')])
+        assert first[0].match_type == 'EXACT'
+        assert second[0].match_type == 'FUZZY'
+        assert second == match_players(ref, [_player(extern_id='E002', last_name='MULLER')])
+
+
+class TestParallelMatching:
+    """Tests for matching with a process pool."""
+
+    def test_workers_match_sequential_results(self):
+        ref = [
+            _player(),
+            _player(extern_id='P002', last_name='SIMON', first_name='Csaba'),
+            _player(extern_id='P003', last_name='LAGERLOF', first_name='Anna', sex='F'),
+        ]
+        event = [
+            _player(extern_id='E001'),
+            _player(extern_id='E002', last_name='Csaba', first_name='SIMON'),
+            _player(extern_id='E003', last_name='LAGERLOEF', first_name='Anna', sex='F'),
+            _player(extern_id='E004', last_name='XYZ_SOMETHING'),
+        ]
+        sequential = match_players(ref, event)
+        parallel = match_players(ref, event, workers=2)
+        assert parallel == sequential
+
+
 class TestIntegrationWithRealData:
     """Integration tests with actual CSV data files."""
 
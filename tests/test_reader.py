@@ -15,6 +15,11 @@ class TestDetectEncoding:
     def test_utf16le_bom(self, data_dir):
         assert detect_encoding(data_dir / 'Reference.csv') == 'utf-16-le'
 
+    def test_utf16be_bom(self, tmp_path):
+        f = tmp_path / 'test.csv'
+        f.write_bytes(b'\xfe\xff' + 'hello'.encode('utf-16-be'))
+        assert detect_encoding(f) == 'utf-16-be'
+
     def test_utf8_fallback(self, tmp_path):
         f = tmp_path / 'test.csv'
         f.write_text('hello', encoding='utf-8')
@@ -87,3 +92,66 @@ class TestReadPlayers:
         f.write_text('Col1\tCol2\na\tb\n', encoding='utf-8')
         with pytest.raises(ValueError, match='Fehlende Spalten'):
             read_players(f)
+
+    def test_utf16le_bom_not_part_of_header(self, tmp_path):
+        f = tmp_path / 'utf16.csv'
+        content = (
+            'Extern ID\tLast Name\tFirst Name\tSex\tAssociation\tDoB\tMoB\tYoB\r\n'
+            'P001\tLAGERLÖF\tAnna\tF\tSWE\t3\t4\t1980\r\n'
+        )
+        f.write_bytes(b'\xff\xfe' + content.encode('utf-16-le'))
+        players = read_players(f)
+        assert len(players) == 1
+        assert players[0].extern_id == 'P001'
+        assert players[0].last_name == 'LAGERLÖF'
+        assert players[0].yob == 1980
+
+    def test_utf16be_file(self, tmp_path):
+        f = tmp_path / 'utf16be.csv'
+        content = (
+            'Extern ID\tLast Name\tFirst Name\tSex\tAssociation\tDoB\tMoB\tYoB\r\n'
+            'P001\tLAGERLÖF\tAnna\tF\tSWE\t3\t4\t1980\r\n'
+        )
+        f.write_bytes(b'\xfe\xff' + content.encode('utf-16-be'))
+        players = read_players(f)
+        assert len(players) == 1
+        assert players[0].last_name == 'LAGERLÖF'
+
+    def test_columns_by_header_position(self, tmp_path):
+        f = tmp_path / 'reordered.csv'
+        f.write_text(
+            'YoB\tMoB\tDoB\tAssociation\tSex\tFirst  Name\tLast Name\tExtern ID\tNote\n'
+            '1985\t6\t15\tGER\tM\tHans\t MUELLER \tP001\tx\n'
+            '\n'
+            '1990\t1\t2\tFRA\tF\tMarie\tDUPONT\tP002\n',
+            encoding='utf-8',
+        )
+        players = read_players(f)
+        assert [p.extern_id for p in players] == ['P001', 'P002']
+        assert players[0].last_name == 'MUELLER'
+        assert (players[0].dob, players[0].mob, players[0].yob) == (15, 6, 1985)
+        assert players[1].association == 'FRA'
+
+    def test_out_of_range_birth_field_skipped(self, tmp_path):
+        f = tmp_path / 'huge.csv'
+        f.write_text(
+            'Extern ID\tLast Name\tFirst Name\tSex\tAssociation\tDoB\tMoB\tYoB\n'
+            'P001\tMUELLER\tHans\tM\tGER\t15\t6\t100000000000000000000\n'
+            'P002\tSCHMIDT\tKarl\tM\tGER\t1\t2\t1990\n',
+            encoding='utf-8',
+        )
+        players = read_players(f)
+        assert [p.extern_id for p in players] == ['P002']
+
+    def test_sex_and_association_interned(self, tmp_path):
+        f = tmp_path / 'interned.csv'
+        f.write_text(
+            'Extern ID\tLast Name\tFirst Name\tSex\tAssociation\tDoB\tMoB\tYoB\n'
+            'P001\tMUELLER\tHans\tM\tGER\t15\t6\t1985\n'
+            'P002\tSCHMIDT\tKarl\tM\tGER\t1\t2\t1990\n',
+            encoding='utf-8',
+        )
+        first, second = read_players(f)
+        # Only a multi-character value shows the effect: CPython caches
+        # all one-character strings, so sex would be shared regardless
+        assert first.association is second.association
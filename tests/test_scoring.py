@@ -1,13 +1,23 @@
 """Tests for core.scoring module."""
 
-from core import Player
+from dataclasses import replace
+
+import numpy as np
+
+from core import ISSUE_BITS, Player
+from core.normalize import prefill_tolerant_cache
 from core.scoring import (
     WEIGHTS,
+    build_ref_arrays,
     calculate_confidence,
     calculate_confidence_tolerant,
+    calculate_confidence_tolerant_batch,
+    confidence_units,
+    detect_issue_bits,
     detect_issues,
     is_dob_mob_swapped,
     normalize_for_tolerant_comparison,
+    score_batch,
 )
 
 
@@ -78,6 +88,48 @@ class TestCalculateConfidence:
         assert score == 1.0 - WEIGHTS['dob']
 
 
+class TestScoreBatch:
+    """Tests for vectorized confidence scoring."""
+
+    def test_matches_scalar_scores(self):
+        e = _player(dob=6, mob=15)
+        refs = [
+            _player(),
+            _player(dob=15, mob=6),
+            _player(dob=6, mob=15, yob=1990, sex='F'),
+            _player(association='FRA'),
+        ]
+        ln_sims = np.array([1.0, 0.9, 0.95, 0.87])
+        fn_sims = np.array([0.8, 1.0, 0.85, 0.9])
+        indices = np.arange(len(refs))
+        scores = score_batch(e, ln_sims, fn_sims, build_ref_arrays(refs), indices)
+        expected = [
+            confidence_units(e, r, ls, fs)
+            for r, ls, fs in zip(refs, ln_sims, fn_sims)
+        ]
+        assert scores.tolist() == expected
+
+    def test_unknown_categories_never_match(self):
+        e = _player(sex='X', association='ZZZ')
+        r = _player()
+        ones = np.array([1.0])
+        scores = score_batch(e, ones, ones, build_ref_arrays([r]), np.array([0]))
+        assert scores[0] == confidence_units(e, r, 1.0, 1.0) == 9000
+
+    def test_fields_narrowed_without_losing_values(self):
+        ones = np.array([1.0])
+        arrays = build_ref_arrays([_player()])
+        assert arrays.fields.dtype == np.int16
+        # An event year outside int16 must not wrap around onto the ref year
+        e = _player(yob=1985 + 65536)
+        assert score_batch(e, ones, ones, arrays, np.array([0]))[0] == 8500
+
+        wide = build_ref_arrays([_player(yob=40000)])
+        assert wide.fields.dtype == np.int32
+        e = _player(yob=40000)
+        assert score_batch(e, ones, ones, wide, np.array([0]))[0] == 10000
+
+
 class TestIsDobMobSwapped:
     """Tests for DoB/MoB swap detection."""
 
@@ -101,6 +153,13 @@ class TestIsDobMobSwapped:
         r = _player(dob=15, mob=6)
         assert is_dob_mob_swapped(e, r) is False
 
+    def test_out_of_range_values_do_not_collide(self):
+        # Packed naively, (dob=100, mob=0) and (dob=0, mob=1) give the same key
+        e = _player(dob=100, mob=0)
+        r = _player(dob=1, mob=0)
+        assert is_dob_mob_swapped(e, r) is False
+        assert detect_issues(e, r, 'EXACT', 1.0, 1.0) == ['DOB_MISMATCH']
+
 
 class TestDetectIssues:
     """Tests for issue detection."""
@@ -148,12 +207,28 @@ class TestDetectIssues:
         issues = detect_issues(e, r, 'EXACT', 1.0, 1.0)
         assert 'SEX_MISMATCH' in issues
 
+    def test_sex_and_assoc_case_insensitive(self):
+        e = _player(sex='m', association='ger')
+        r = _player(sex='M', association='GER')
+        issues = detect_issues(e, r, 'EXACT', 1.0, 1.0)
+        assert issues == []
+
     def test_assoc_mismatch(self):
         e = _player(association='ISR')
         r = _player(association='NZL')
         issues = detect_issues(e, r, 'EXACT', 1.0, 1.0)
         assert 'ASSOC_MISMATCH' in issues
 
+    def test_issue_bits_match_issue_codes(self):
+        e = _player(yob=1990, association='ISR')
+        bits = detect_issue_bits(e, _player(), 'FUZZY', 0.9, 1.0)
+        assert bits == (
+            ISSUE_BITS['LASTNAME_FUZZY'] | ISSUE_BITS['YOB_MISMATCH'] | ISSUE_BITS['ASSOC_MISMATCH']
+        )
+        assert detect_issues(e, _player(), 'FUZZY', 0.9, 1.0) == [
+            'LASTNAME_FUZZY', 'YOB_MISMATCH', 'ASSOC_MISMATCH',
+        ]
+
 
 class TestNormalizeForTolerantComparison:
     """Tests for accent/punctuation-tolerant normalization."""
@@ -184,6 +259,29 @@ class TestNormalizeForTolerantComparison:
     def test_plain_ascii_unchanged(self):
         assert normalize_for_tolerant_comparison('MUELLER') == 'MUELLER'
 
+    def test_latin_extended_and_other_scripts(self):
+        assert normalize_for_tolerant_comparison('Ştefan Ţiriac') == 'STEFANTIRIAC'
+        assert normalize_for_tolerant_comparison('Straße') == 'STRASSE'
+        assert normalize_for_tolerant_comparison('Łukasz') == 'ŁUKASZ'
+        assert normalize_for_tolerant_comparison('Δημήτρης') == 'ΔΗΜΗΤΡΗΣ'
+
+    def test_prefilled_cache_matches_single_names(self):
+        names = ['Jean-Pierre', 'Müller', 'van der Berg', 'Δημήτρης', 'A\x01B', '', 'Müller']
+        prefill_tolerant_cache(names)
+        assert [normalize_for_tolerant_comparison(name) for name in names] == [
+            'JEANPIERRE', 'MULLER', 'VANDERBERG', 'ΔΗΜΗΤΡΗΣ', 'A\x01B', '', 'MULLER',
+        ]
+
+    def test_player_precomputes_tolerant_names(self):
+        p = _player(last_name='José-María', first_name='François')
+        assert p.ln_tol == 'JOSEMARIA'
+        assert p.fn_tol == 'FRANCOIS'
+
+    def test_replace_recomputes_tolerant_names(self):
+        p = replace(_player(last_name='MUELLER'), last_name='Schmidt')
+        assert p.ln_key == 'SCHMIDT'
+        assert p.ln_tol == 'SCHMIDT'
+
 
 class TestCalculateConfidenceTolerant:
     """Tests for tolerant confidence scoring."""
@@ -230,3 +328,13 @@ class TestCalculateConfidenceTolerant:
         r = _player(dob=15, mob=6)
         score = calculate_confidence_tolerant(e, r, 1.0, 1.0)
         assert score == 1.0
+
+    def test_batch_matches_scalar_scores(self):
+        pairs = [
+            (_player(last_name='Müller'), _player(last_name='Muller'), 0.95, 1.0),
+            (_player(first_name='Jean-Pierre'), _player(first_name='Jean Pierre'), 1.0, 0.9),
+            (_player(last_name='Schmidt'), _player(last_name='Schmitt', dob=3), 0.9, 1.0),
+        ]
+        events, refs, ln_sims, fn_sims = (list(col) for col in zip(*pairs))
+        expected = [calculate_confidence_tolerant(*pair) for pair in pairs]
+        assert calculate_confidence_tolerant_batch(events, refs, ln_sims, fn_sims) == expected